@@ -9,21 +9,33 @@ Usage:
     python analyze_solver_types.py <solver_name>
     python analyze_solver_types.py --all  # Analyze all solvers
     python analyze_solver_types.py --export-json  # Export type mappings
+    python analyze_solver_types.py --export-artifact  # Prebuilt artifact for deployment/app.py
+    python analyze_solver_types.py --classify last  # Classify calls to last()
+    python analyze_solver_types.py --bulk [patch_file]  # One patch for all solvers
 """
 
 import ast
+import difflib
+import hashlib
 import inspect
 import json
+import re
+import time
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
 
+# Bump when the layout of the analysis artifact changes
+ANALYSIS_ARTIFACT_VERSION = 1
+
+
 class DSLTypeAnalyzer:
     """Analyzes DSL functions to build type mappings."""
     
     def __init__(self, dsl_file='arc-dsl/dsl.py'):
         self.dsl_file = dsl_file
         self.type_mapping: Dict[str, str] = {}
+        self.param_types: Dict[str, List[str]] = {}
         self.callable_functions = set()
         self._build_type_mapping()
     
@@ -36,6 +48,12 @@ class DSLTypeAnalyzer:
             if isinstance(node, ast.FunctionDef):
                 func_name = node.name
                 
+                # Extract parameter annotations (used to match call sites)
+                self.param_types[func_name] = [
+                    ast.unparse(arg.annotation) if arg.annotation else 'Any'
+                    for arg in node.args.args
+                ]
+                
                 # Extract return type annotation
                 if node.returns:
                     return_type = ast.unparse(node.returns)
@@ -49,6 +67,10 @@ class DSLTypeAnalyzer:
         """Get the return type of a DSL function."""
         return self.type_mapping.get(function_name)
     
+    def get_param_types(self, function_name: str) -> List[str]:
+        """Get the parameter annotations of a DSL function."""
+        return self.param_types.get(function_name, [])
+    
     def is_callable_function(self, function_name: str) -> bool:
         """Check if a function returns a Callable."""
         return function_name in self.callable_functions
@@ -63,6 +85,41 @@ class DSLTypeAnalyzer:
             json.dump(data, f, indent=2)
         print(f"✅ Exported type mapping to {output_file}")
         return output_file
+    
+    def build_usage_index(self, solvers_source: str) -> Dict[str, Dict[str, Any]]:
+        """Index the solver lines calling each DSL function."""
+        index = {name: {'call_count': 0, 'lines': []} for name in self.type_mapping}
+        for node in ast.walk(ast.parse(solvers_source)):
+            if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+                entry = index.get(node.func.id)
+                if entry is not None:
+                    entry['call_count'] += 1
+                    entry['lines'].append(node.lineno)
+        for entry in index.values():
+            entry['lines'].sort()
+        return index
+    
+    def export_artifact(self, solvers_file='arc-dsl/solvers.py',
+                        output_file='arc-dsl/analysis_artifact.json'):
+        """Export type mapping plus solver usage index as one versioned artifact.
+        
+        The deployment app loads this file in a single read at startup instead
+        of re-deriving usage data from solvers.py on every request.
+        """
+        solvers_bytes = Path(solvers_file).read_bytes()
+        solvers_source = solvers_bytes.decode()
+        data = {
+            'version': ANALYSIS_ARTIFACT_VERSION,
+            'source_file': solvers_file,
+            'source_sha256': hashlib.sha256(solvers_bytes).hexdigest(),
+            'type_mapping': self.type_mapping,
+            'callable_functions': sorted(self.callable_functions),
+            'usage_index': self.build_usage_index(solvers_source),
+        }
+        with open(output_file, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        print(f"✅ Exported analysis artifact v{ANALYSIS_ARTIFACT_VERSION} to {output_file}")
+        return output_file
 
 
 class SolverTypeInference:
@@ -138,6 +195,39 @@ class SolverTypeInference:
             )
         }
     
+    def infer_variable_types(self, solver_node: ast.FunctionDef, infer_expression=None) -> Dict[str, str]:
+        """Infer variable types for a parsed solver function.
+        
+        infer_expression overrides infer_expression_type (the call-site
+        classifier uses it to keep element types of bare Tuple returns).
+        """
+        infer_expression = infer_expression or self.infer_expression_type
+        variables = {'I': 'Grid'}
+        for stmt in solver_node.body:
+            if not isinstance(stmt, ast.Assign) or len(stmt.targets) != 1:
+                continue
+            target = stmt.targets[0]
+            if not isinstance(target, ast.Name):
+                continue
+            if target.id == 'O':
+                # Output is always Grid
+                variables[target.id] = 'Grid'
+                continue
+            var_type = infer_expression(stmt.value, variables)
+            if var_type:
+                variables[target.id] = var_type
+        return variables
+    
+    def infer_expression_type(self, node: ast.expr, variables: Dict[str, str]) -> Optional[str]:
+        """Infer the type of an expression from variables, constants and DSL returns."""
+        if isinstance(node, ast.Name):
+            if node.id in variables:
+                return variables[node.id]
+            return self.constants_types.get(node.id)
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            return self.dsl.get_return_type(node.func.id)
+        return None
+    
     def generate_annotated_code(self, solver_func, solver_name: str) -> str:
         """Generate solver code with type annotations."""
         analysis = self.analyze_solver(solver_func, solver_name)
@@ -217,6 +307,254 @@ new_content = '\\n'.join(new_lines)
             'variables_annotated': len(analysis['variables']),
             'has_callables': analysis['has_callables']
         }
+    
+    SOLVER_DEF = re.compile(r'^def (solve_\w+)\(I\):\s*$')
+    
+    def annotate_solver_block(self, block: List[str]) -> List[str]:
+        """Annotate the lines of one solver definition (def line to next top-level line)."""
+        func_node = ast.parse('\n'.join(block)).body[0]
+        variables = self.infer_variable_types(func_node)
+        annotated = list(block)
+        
+        annotated[0] = f"def {func_node.name}(I: Grid) -> Grid:"
+        for stmt in func_node.body:
+            if not isinstance(stmt, ast.Assign) or len(stmt.targets) != 1:
+                continue
+            target = stmt.targets[0]
+            if not isinstance(target, ast.Name) or target.id not in variables:
+                continue
+            idx = target.lineno - 1
+            line = annotated[idx]
+            annotated[idx] = (
+                f"{line[:target.end_col_offset]}: {variables[target.id]}"
+                f"{line[target.end_col_offset:]}"
+            )
+        return annotated
+    
+    def annotate_source(self, source: str) -> Dict[str, Any]:
+        """Annotate every solver in solvers.py source in a single pass.
+        
+        Solvers are collected line by line and annotated as soon as their
+        block ends, so a solver that fails to parse is left unchanged and
+        reported without affecting the others.
+        """
+        new_lines: List[str] = []
+        annotated: List[str] = []
+        failed: Dict[str, str] = {}
+        block: List[str] = []
+        
+        def flush():
+            if not block:
+                return
+            solver_name = self.SOLVER_DEF.match(block[0]).group(1)
+            try:
+                new_lines.extend(self.annotate_solver_block(block))
+                annotated.append(solver_name)
+            except (SyntaxError, IndexError, AttributeError) as e:
+                failed[solver_name] = f"{type(e).__name__}: {e}"
+                new_lines.extend(block)
+            block.clear()
+        
+        for line in source.split('\n'):
+            is_solver_def = self.SOLVER_DEF.match(line) is not None
+            if is_solver_def or (block and line and not line[0].isspace()):
+                flush()
+            if is_solver_def or block:
+                block.append(line)
+            else:
+                new_lines.append(line)
+        flush()
+        
+        return {
+            'new_content': '\n'.join(new_lines),
+            'annotated': annotated,
+            'failed': failed,
+        }
+    
+    def generate_bulk_patch(self, solvers_file='arc-dsl/solvers.py') -> Dict[str, Any]:
+        """Annotate all solvers and return one unified diff (apply with patch -p1)."""
+        start = time.perf_counter()
+        original_content = Path(solvers_file).read_text()
+        result = self.annotate_source(original_content)
+        diff = ''.join(difflib.unified_diff(
+            original_content.splitlines(keepends=True),
+            result['new_content'].splitlines(keepends=True),
+            fromfile=f'a/{solvers_file}',
+            tofile=f'b/{solvers_file}',
+        ))
+        elapsed = time.perf_counter() - start
+        solver_count = len(result['annotated']) + len(result['failed'])
+        
+        return {
+            'file': solvers_file,
+            'description': f"Add type annotations to {len(result['annotated'])} solvers",
+            'diff': diff,
+            'annotated': result['annotated'],
+            'failed': result['failed'],
+            'elapsed_seconds': elapsed,
+            'solvers_per_second': solver_count / elapsed if elapsed > 0 else float('inf'),
+        }
+
+
+class CallSiteClassifier:
+    """Maps calls to a generic DSL function onto its specialized versions.
+    
+    Argument types are inferred from each solver body (same rules as
+    SolverTypeInference) and compared against the first parameter
+    annotation of every specialized candidate. Each call site gets a
+    suggested replacement and a confidence score in [0, 1].
+    
+    Only a concrete argument type matching the candidate's parameter (or its
+    element type) scores above the default auto-apply threshold of 0.8.
+    Unknown arguments (Any, Container, ...) and name-only matches always go
+    to a human.
+    """
+    
+    # ARC-DSL type aliases expanded to their container form for matching
+    TYPE_ALIASES = {
+        'Objects': 'FrozenSet[Object]',
+        'Indices': 'FrozenSet[IntegerTuple]',
+        'IndicesSet': 'FrozenSet[Indices]',
+        'IntegerSet': 'FrozenSet[Integer]',
+        'TupleTuple': 'Tuple[Tuple]',
+        'ContainerContainer': 'Container[Container]',
+    }
+    GENERIC_TYPES = {'Any', 'Container', 'ContainerContainer', 'Tuple', 'FrozenSet'}
+    # DSL functions annotated with a bare Tuple whose element type is known
+    TUPLE_ELEMENT_TYPES = {'hsplit': 'Grid', 'vsplit': 'Grid'}
+    
+    EXACT_MATCH = 1.0
+    ELEMENT_MATCH = 0.9
+    NAME_MATCH = 0.6  # Below the auto-apply threshold: naming alone never rewrites
+    GENERIC_MATCH = 0.5
+    MISMATCH = 0.1
+    
+    def __init__(self, inferencer: SolverTypeInference):
+        self.inferencer = inferencer
+        self.dsl = inferencer.dsl
+    
+    def _normalize(self, type_str: str) -> str:
+        return self.TYPE_ALIASES.get(type_str, type_str).replace(' ', '')
+    
+    def _element_type(self, type_str: str) -> Optional[str]:
+        """Return X for container types such as FrozenSet[X] or Tuple[X, ...]."""
+        normalized = self._normalize(type_str)
+        if '[' not in normalized or not normalized.endswith(']'):
+            return None
+        inner = normalized[normalized.index('[') + 1:-1]
+        return inner.split(',')[0]
+    
+    def _is_generic(self, type_str: str) -> bool:
+        return type_str in self.GENERIC_TYPES or self._normalize(type_str) in self.GENERIC_TYPES
+    
+    def infer_expression_type(self, node: ast.expr, variables: Dict[str, str]) -> Optional[str]:
+        """SolverTypeInference.infer_expression_type, keeping element types of bare Tuple returns."""
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            if node.func.id in self.TUPLE_ELEMENT_TYPES:
+                return f'Tuple[{self.TUPLE_ELEMENT_TYPES[node.func.id]}, ...]'
+            if node.func.id == 'order' and node.args:
+                # order() sorts its container, so the elements are unchanged
+                container_type = self.infer_expression_type(node.args[0], variables)
+                element = self._element_type(container_type) if container_type else None
+                if element:
+                    return f'Tuple[{element}, ...]'
+        return self.inferencer.infer_expression_type(node, variables)
+    
+    def score_candidate(self, arg_type: Optional[str], candidate: str, original_function: str) -> float:
+        """Score how well an argument type fits a specialized function."""
+        if not arg_type:
+            return 0.0
+        params = self.dsl.get_param_types(candidate)
+        param_type = params[0] if params else 'Any'
+        
+        # An unknown argument type says nothing about which candidate fits
+        if self._is_generic(arg_type):
+            return self.GENERIC_MATCH if self._is_generic(param_type) else self.MISMATCH
+        
+        if self._normalize(arg_type) == self._normalize(param_type):
+            return self.EXACT_MATCH
+        arg_element = self._element_type(arg_type)
+        if arg_element and not self._is_generic(arg_element) and arg_element == self._element_type(param_type):
+            return self.ELEMENT_MATCH
+        
+        # Fall back to the naming convention: last_grid for containers of Grid
+        suffix = candidate[len(original_function):].lstrip('_').lower()
+        if suffix and arg_element and arg_element.lower().startswith(suffix):
+            return self.NAME_MATCH
+        if param_type in self.GENERIC_TYPES:
+            return self.GENERIC_MATCH
+        return self.MISMATCH
+    
+    def classify_call(self, call: ast.Call, variables: Dict[str, str],
+                      original_function: str, specialized_functions: List[str]) -> Dict[str, Any]:
+        """Classify one call site and compute a confidence score."""
+        arg_type = self.infer_expression_type(call.args[0], variables) if call.args else None
+        scores = {
+            func: self.score_candidate(arg_type, func, original_function)
+            for func in specialized_functions
+        }
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        best_func, best_score = ranked[0] if ranked else (None, 0.0)
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        
+        # A clear winner keeps its score; a near tie halves it
+        confidence = best_score if best_score - runner_up >= 0.3 else best_score / 2
+        return {
+            'arg_type': arg_type,
+            'scores': scores,
+            # Only suggest when some candidate fits better than a plain mismatch
+            'suggested_replacement': best_func if best_score > self.MISMATCH else None,
+            'confidence': round(confidence, 2),
+        }
+    
+    def classify_source(self, solvers_source: str, original_function: str,
+                        specialized_functions: List[str]) -> List[Dict[str, Any]]:
+        """Classify every call to original_function in solvers source."""
+        tree = ast.parse(solvers_source)
+        lines = solvers_source.split('\n')
+        results = []
+        
+        for solver_node in tree.body:
+            if not isinstance(solver_node, ast.FunctionDef):
+                continue
+            variables = self.inferencer.infer_variable_types(solver_node, self.infer_expression_type)
+            for node in ast.walk(solver_node):
+                if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                        and node.func.id == original_function):
+                    continue
+                result = self.classify_call(node, variables, original_function, specialized_functions)
+                result.update({
+                    'solver': solver_node.name,
+                    'line': node.lineno,
+                    'col': node.func.col_offset,
+                    'original_line': lines[node.lineno - 1].strip(),
+                })
+                results.append(result)
+        
+        return sorted(results, key=lambda r: (r['line'], r['col']))
+    
+    @staticmethod
+    def partition(results: List[Dict[str, Any]], threshold: float = 0.8):
+        """Split classified calls into (confident, ambiguous) lists."""
+        confident, ambiguous = [], []
+        for result in results:
+            if result['suggested_replacement'] and result['confidence'] >= threshold:
+                confident.append(result)
+            else:
+                ambiguous.append(result)
+        return confident, ambiguous
+    
+    @staticmethod
+    def apply_replacements(source: str, original_function: str, changes: List[Dict[str, Any]]) -> str:
+        """Rewrite the call name at each (line, col), right to left per line."""
+        lines = source.split('\n')
+        for change in sorted(changes, key=lambda c: (c['line'], c['col']), reverse=True):
+            line_idx, col = change['line'] - 1, change['col']
+            line = lines[line_idx]
+            if line[col:col + len(original_function)] != original_function:
+                raise ValueError(f"Line {change['line']} no longer calls {original_function} at column {col}")
+            lines[line_idx] = line[:col] + change['suggested_replacement'] + line[col + len(original_function):]
+        return '\n'.join(lines)
 
 
 def main():
@@ -239,6 +577,53 @@ def main():
         print("   This can be used by your refactoring agents!")
         return
     
+    if '--export-artifact' in sys.argv:
+        dsl_analyzer.export_artifact()
+        return
+    
+    if '--bulk' in sys.argv:
+        # Annotate every solver in one pass and write a single unified diff
+        args = sys.argv[sys.argv.index('--bulk') + 1:]
+        patch_file = args[0] if args else 'arc-dsl/solvers_annotations.patch'
+        
+        inferencer = SolverTypeInference(dsl_analyzer)
+        result = inferencer.generate_bulk_patch()
+        Path(patch_file).write_text(result['diff'])
+        
+        print(f"\n✅ Annotated {len(result['annotated'])} solvers in "
+              f"{result['elapsed_seconds']:.3f}s ({result['solvers_per_second']:.0f} solvers/s)")
+        if result['failed']:
+            print(f"⚠️  {len(result['failed'])} solvers left unchanged:")
+            for solver_name, error in result['failed'].items():
+                print(f"    {solver_name}: {error}")
+        print(f"📄 Patch written to {patch_file} (apply with: patch -p1 < {patch_file})")
+        return
+    
+    if '--classify' in sys.argv:
+        # Classify call sites of a generic function against its specializations
+        function_name = sys.argv[sys.argv.index('--classify') + 1]
+        specialized = sorted(
+            name for name in dsl_analyzer.type_mapping
+            if name.startswith(f'{function_name}_')
+        )
+        if not specialized:
+            print(f"❌ No specialized versions of {function_name} found in dsl.py")
+            return
+        
+        classifier = CallSiteClassifier(SolverTypeInference(dsl_analyzer))
+        results = classifier.classify_source(
+            Path('arc-dsl/solvers.py').read_text(), function_name, specialized
+        )
+        confident, ambiguous = classifier.partition(results)
+        print(f"\n📊 {len(results)} calls to {function_name}(): "
+              f"{len(confident)} confident, {len(ambiguous)} ambiguous")
+        for result in results:
+            marker = '✅' if result in confident else '❓'
+            print(f"  {marker} line {result['line']:5d} {result['solver']}: "
+                  f"{result['arg_type']} → {result['suggested_replacement']} "
+                  f"({result['confidence']:.2f})")
+        return
+    
     # Import solvers
     sys.path.insert(0, 'arc-dsl')
     import solvers
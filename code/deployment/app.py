@@ -3,33 +3,97 @@ FastAPI Web Application for ARC-DSL Refactoring Agent
 Deployment-ready Cloud Run application with HITL workflow
 """
 
+import time
+
+# Measured from here so /api/health can report time-to-ready
+_IMPORT_STARTED = time.perf_counter()
+
 import os
 import json
+import hashlib
+from contextlib import asynccontextmanager
 from typing import Dict, List, Optional
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
-import google.genai as genai
-from google.genai import types
 from pathlib import Path
 import sys
 
 # Add parent directory to path for imports
-sys.path.append(str(Path(__file__).parent.parent))
+CODE_DIR = Path(__file__).parent.parent
+sys.path.append(str(CODE_DIR))
+
+from analyze_solver_types import ANALYSIS_ARTIFACT_VERSION
 
-app = FastAPI(title="ARC-DSL Refactoring Agent", version="1.0.0")
+ANALYSIS_ARTIFACT = Path(os.getenv(
+    "ANALYSIS_ARTIFACT",
+    CODE_DIR / "arc-dsl/analysis_artifact.json"
+))
 
-# Initialize Gemini
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-if not GOOGLE_API_KEY:
-    raise ValueError("GOOGLE_API_KEY environment variable not set")
 
-client = genai.Client(api_key=GOOGLE_API_KEY)
+# Optional API endpoint override, e.g. the local fake_gemini.py used by loadtest.py
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL")
+
+# Gemini client is created on first use so startup needs no key or SDK import
+_client = None
+
+# Prebuilt type map + usage index (see analyze_solver_types.py --export-artifact)
+analysis_artifact: Optional[Dict] = None
+startup_seconds: Optional[float] = None
 
 # Global state for session management
 workflow_sessions: Dict[str, Dict] = {}
 
+
+def get_client():
+    """Return the shared Gemini client, creating it on first call"""
+    global _client
+    if _client is None:
+        if not GOOGLE_API_KEY:
+            raise ValueError("GOOGLE_API_KEY environment variable not set")
+        import google.genai as genai
+        http_options = {"base_url": GEMINI_BASE_URL} if GEMINI_BASE_URL else None
+        _client = genai.Client(api_key=GOOGLE_API_KEY, http_options=http_options)
+    return _client
+
+
+def load_analysis_artifact(path: Path = ANALYSIS_ARTIFACT) -> Optional[Dict]:
+    """Load the prebuilt analysis artifact in one read, or None if missing/stale"""
+    try:
+        data = json.loads(path.read_bytes())
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Analysis artifact not loaded ({e}); analyzing source files per request")
+        return None
+    
+    if data.get("version") != ANALYSIS_ARTIFACT_VERSION:
+        print(f"⚠️  Analysis artifact version {data.get('version')} != {ANALYSIS_ARTIFACT_VERSION}; ignoring")
+        return None
+    
+    # solvers.py is rewritten in place by the HITL workflow, which makes the index stale
+    try:
+        source_sha256 = hashlib.sha256((CODE_DIR / data["source_file"]).read_bytes()).hexdigest()
+    except OSError as e:
+        print(f"⚠️  Analysis artifact source not readable ({e}); ignoring")
+        return None
+    if source_sha256 != data.get("source_sha256"):
+        print(f"⚠️  Analysis artifact is stale ({data['source_file']} changed); ignoring")
+        return None
+    return data
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global analysis_artifact, startup_seconds
+    analysis_artifact = load_analysis_artifact()
+    startup_seconds = time.perf_counter() - _IMPORT_STARTED
+    print(f"✅ Ready in {startup_seconds:.3f}s (artifact: {'loaded' if analysis_artifact else 'none'})")
+    yield
+
+
+app = FastAPI(title="ARC-DSL Refactoring Agent", version="1.0.0", lifespan=lifespan)
+
 # ============================================================================
 # Pydantic Models
 # ============================================================================
@@ -57,7 +121,18 @@ def analyze_function_usage(function_name: str, source_file: str) -> Dict:
     import ast
     import re
     
-    file_path = Path(__file__).parent.parent / source_file
+    # Fast path: answer from the prebuilt usage index
+    if analysis_artifact and source_file == analysis_artifact["source_file"]:
+        usage = analysis_artifact["usage_index"].get(function_name)
+        if usage is not None:
+            return {
+                "function_name": function_name,
+                "call_count": usage["call_count"],
+                "source_file": source_file,
+                "analysis_complete": True
+            }
+    
+    file_path = CODE_DIR / source_file
     if not file_path.exists():
         return {"error": f"File not found: {source_file}"}
     
@@ -96,7 +171,8 @@ Return JSON array:
 """
     
     try:
-        response = client.models.generate_content(
+        from google.genai import types
+        response = get_client().models.generate_content(
             model="gemini-2.0-flash-lite",
             contents=prompt,
             config=types.GenerateContentConfig(
@@ -131,7 +207,8 @@ Return JSON: {{"verdict": "approve|reject|needs_modification", "reasoning": "...
 """
     
     try:
-        response = client.models.generate_content(
+        from google.genai import types
+        response = get_client().models.generate_content(
             model="gemini-2.0-flash-lite",
             contents=CODE_REVIEW_PROMPT,
             config=types.GenerateContentConfig(
@@ -333,6 +410,9 @@ async def health_check():
     return {
         "status": "healthy",
         "gemini_configured": bool(GOOGLE_API_KEY),
+        "gemini_client_ready": _client is not None,
+        "artifact_version": analysis_artifact["version"] if analysis_artifact else None,
+        "startup_seconds": startup_seconds,
         "active_sessions": len(workflow_sessions)
     }
 
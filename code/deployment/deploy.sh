@@ -48,12 +48,20 @@ gcloud config set project $PROJECT_ID
 
 # Enable required APIs
 echo "🔧 Enabling required APIs..."
-gcloud services enable run.googleapis.com cloudbuild.googleapis.com --quiet
+gcloud services enable run.googleapis.com cloudbuild.googleapis.com containerregistry.googleapis.com --quiet
+
+# Build from code/ so the image contains arc-dsl and the prebuilt analysis artifact
+IMAGE="gcr.io/$PROJECT_ID/$SERVICE_NAME"
+echo "🔨 Building image $IMAGE..."
+gcloud builds submit .. \
+  --config cloudbuild.yaml \
+  --substitutions _IMAGE="$IMAGE" \
+  --quiet
 
 # Deploy to Cloud Run
 echo "🚀 Deploying to Cloud Run..."
 gcloud run deploy $SERVICE_NAME \
-  --source . \
+  --image $IMAGE \
   --region $REGION \
   --platform managed \
   --allow-unauthenticated \
@@ -0,0 +1,87 @@
+"""
+Local Stand-in for the Gemini API (load testing only)
+
+Serves `generateContent` with canned JSON answers for the two prompts used by
+app.py (specialization proposals and ADK code review), after a configurable
+delay and with a configurable error rate.
+
+Configuration (environment variables):
+    FAKE_GEMINI_LATENCY_MS  - mean response delay in ms (default: 300)
+    FAKE_GEMINI_JITTER_MS   - uniform +/- jitter around the mean (default: 100)
+    FAKE_GEMINI_ERROR_RATE  - fraction of requests answered with HTTP 503 (default: 0.0)
+
+Usage:
+    uvicorn fake_gemini:app --port 9090
+    GEMINI_BASE_URL=http://127.0.0.1:9090 GOOGLE_API_KEY=fake python app.py
+"""
+
+import asyncio
+import json
+import os
+import random
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+LATENCY_MS = float(os.getenv("FAKE_GEMINI_LATENCY_MS", 300))
+JITTER_MS = float(os.getenv("FAKE_GEMINI_JITTER_MS", 100))
+ERROR_RATE = float(os.getenv("FAKE_GEMINI_ERROR_RATE", 0.0))
+
+app = FastAPI(title="Fake Gemini")
+
+request_count = 0
+error_count = 0
+
+
+def _proposals() -> list:
+    return [
+        {
+            "name": f"specialized_{kind.lower()}",
+            "signature": f"def specialized_{kind.lower()}(container: {kind}) -> Any",
+            "implementation": f"def specialized_{kind.lower()}(container: {kind}) -> Any:\n    return next(iter(container))",
+            "reasoning": f"Fake proposal for {kind} arguments",
+        }
+        for kind in ("Grid", "Objects")
+    ]
+
+
+def _review() -> dict:
+    return {"verdict": "approve", "reasoning": "Fake review", "confidence": "high"}
+
+
+@app.post("/{api_version}/models/{model_action}")
+async def generate_content(api_version: str, model_action: str, request: Request):
+    """Mimic models/{model}:generateContent with a delay and random failures."""
+    global request_count, error_count
+    request_count += 1
+    body = await request.json()
+
+    delay_ms = max(0.0, LATENCY_MS + random.uniform(-JITTER_MS, JITTER_MS))
+    await asyncio.sleep(delay_ms / 1000)
+
+    if random.random() < ERROR_RATE:
+        error_count += 1
+        return JSONResponse(
+            status_code=503,
+            content={"error": {"code": 503, "message": "Fake overload", "status": "UNAVAILABLE"}},
+        )
+
+    prompt = "".join(
+        part.get("text", "")
+        for content in body.get("contents", [])
+        for part in content.get("parts", [])
+    )
+    answer = _review() if "code reviewer" in prompt else _proposals()
+    return {
+        "candidates": [{
+            "content": {"role": "model", "parts": [{"text": json.dumps(answer)}]},
+            "finishReason": "STOP",
+        }],
+        "usageMetadata": {"promptTokenCount": len(prompt) // 4, "candidatesTokenCount": 50},
+    }
+
+
+@app.get("/stats")
+async def stats():
+    """Model calls served and errors injected (lets the harness report model error rate)."""
+    return {"requests": request_count, "errors": error_count}
@@ -0,0 +1,304 @@
+"""
+Load Test Harness for the ARC-DSL Refactoring Agent API
+
+Starts app.py against the local fake Gemini server (fake_gemini.py), drives
+concurrent users hitting /api/analyze, /api/health and /api/metrics, and
+reports throughput, latency percentiles and error rates per endpoint.
+Results can be saved as JSON and compared against a previous run.
+
+Usage (from code/deployment):
+    python loadtest.py --users 20 --duration 30
+    python loadtest.py --latency-ms 800 --error-rate 0.1 --output results.json
+    python loadtest.py --baseline results.json  # Compare with an earlier release
+    python loadtest.py --target http://localhost:8080  # Use an already running app
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+HERE = Path(__file__).parent
+
+
+# ============================================================================
+# Server Management
+# ============================================================================
+
+def free_port() -> int:
+    """Ask the OS for an unused local port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(module: str, port: int, env: Dict[str, str]) -> subprocess.Popen:
+    """Start `module:app` under uvicorn in a subprocess."""
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", f"{module}:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=HERE,
+        env={**os.environ, **env},
+    )
+
+
+def wait_until_ready(url: str, timeout: float = 30.0) -> float:
+    """Poll url until it answers 200; return seconds waited."""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter() - start
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"{url} not ready after {timeout:.0f}s")
+
+
+# ============================================================================
+# Load Generation
+# ============================================================================
+
+def call_endpoint(base_url: str, endpoint: str, args: argparse.Namespace) -> Dict:
+    """Issue one request and record its latency and outcome."""
+    if endpoint == "analyze":
+        body = json.dumps({"generic_function": args.function, "source_file": args.source_file}).encode()
+        request = urllib.request.Request(
+            f"{base_url}/api/analyze", data=body, headers={"Content-Type": "application/json"}
+        )
+    else:
+        request = urllib.request.Request(f"{base_url}/api/{endpoint}")
+
+    record = {"endpoint": endpoint, "status": None, "model_error": False, "session_id": None}
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=args.request_timeout) as response:
+            record["status"] = response.status
+            payload = json.loads(response.read())
+        if endpoint == "analyze":
+            record["session_id"] = payload.get("session_id")
+            # app.py swallows model failures: proposals carry "error", reviews fall back to approve
+            record["model_error"] = any(
+                "error" in p or p.get("adk_review", {}).get("reasoning", "").startswith("Review failed")
+                for p in payload.get("proposals", [])
+            )
+    except urllib.error.HTTPError as e:
+        record["status"] = e.code
+    except Exception as e:
+        record["status"] = type(e).__name__
+    record["latency"] = time.perf_counter() - start
+    return record
+
+
+def run_user(base_url: str, mix: Dict[str, int], deadline: float,
+             args: argparse.Namespace, records: List[Dict], lock: threading.Lock) -> None:
+    """One simulated user: weighted-random requests until the deadline."""
+    endpoints, weights = zip(*mix.items())
+    rng = random.Random()
+    while time.perf_counter() < deadline:
+        record = call_endpoint(base_url, rng.choices(endpoints, weights)[0], args)
+        with lock:
+            records.append(record)
+        if args.think_ms:
+            time.sleep(args.think_ms / 1000)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    rank = max(0, min(len(values) - 1, math.ceil(pct / 100 * len(values)) - 1))
+    return values[rank]
+
+
+def summarize(records: List[Dict], elapsed: float) -> Dict:
+    """Per-endpoint and overall throughput, latency percentiles and error rates."""
+    groups = defaultdict(list)
+    for record in records:
+        groups[record["endpoint"]].append(record)
+
+    summary = {}
+    for endpoint, group in [*sorted(groups.items()), ("all", records)]:
+        latencies = sorted(r["latency"] for r in group)
+        errors = sum(r["status"] != 200 for r in group)
+        model_errors = sum(r["model_error"] for r in group)
+        summary[endpoint] = {
+            "requests": len(group),
+            "throughput_rps": len(group) / elapsed,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p90_ms": percentile(latencies, 90) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "max_ms": latencies[-1] * 1000,
+            "error_rate": errors / len(group),
+            "model_error_rate": model_errors / len(group),
+        }
+
+    # /api/analyze numbers sessions by len(workflow_sessions); repeats mean a race
+    session_ids = [r["session_id"] for r in records if r["session_id"]]
+    summary["all"]["duplicate_session_ids"] = len(session_ids) - len(set(session_ids))
+    return summary
+
+
+# ============================================================================
+# Reporting
+# ============================================================================
+
+def print_report(result: Dict, baseline: Optional[Dict] = None) -> None:
+    """Print a per-endpoint table, with deltas against a baseline run if given."""
+    config = result["config"]
+    print(f"\n{'='*86}")
+    print(f"LOAD TEST: {config['users']} users, {result['elapsed_seconds']:.1f}s, "
+          f"model latency {config['latency_ms']:.0f}±{config['jitter_ms']:.0f} ms, "
+          f"model error rate {config['error_rate']:.0%}")
+    print(f"{'='*86}")
+    print(f"{'endpoint':10s} {'requests':>9s} {'req/s':>8s} {'p50 ms':>9s} {'p90 ms':>9s} "
+          f"{'p99 ms':>9s} {'errors':>8s} {'model err':>10s}")
+    for endpoint, stats in result["summary"].items():
+        print(f"{endpoint:10s} {stats['requests']:9d} {stats['throughput_rps']:8.1f} "
+              f"{stats['p50_ms']:9.1f} {stats['p90_ms']:9.1f} {stats['p99_ms']:9.1f} "
+              f"{stats['error_rate']:8.1%} {stats['model_error_rate']:10.1%}")
+
+    overall = result["summary"]["all"]
+    print(f"{'─'*86}")
+    if result.get("startup_seconds") is not None:
+        print(f"App healthy after {result['startup_seconds']:.2f}s")
+    if result.get("model_calls") is not None and "analyze" in result["summary"]:
+        per_request = result["model_calls"] / max(1, result["summary"]["analyze"]["requests"])
+        print(f"Model calls: {result['model_calls']} ({per_request:.1f} per analyze request), "
+              f"{result['model_errors']} failed ({result['model_errors'] / max(1, result['model_calls']):.1%})")
+    if overall["duplicate_session_ids"]:
+        print(f"⚠️  {overall['duplicate_session_ids']} duplicate session ids from /api/analyze")
+
+    if baseline:
+        print(f"\nCompared with baseline ({baseline['config']['label']}):")
+        for endpoint, stats in result["summary"].items():
+            before = baseline["summary"].get(endpoint)
+            if not before:
+                continue
+            print(f"  {endpoint:10s} req/s {stats['throughput_rps'] - before['throughput_rps']:+8.1f}   "
+                  f"p50 {stats['p50_ms'] - before['p50_ms']:+9.1f} ms   "
+                  f"p99 {stats['p99_ms'] - before['p99_ms']:+9.1f} ms   "
+                  f"errors {(stats['error_rate'] - before['error_rate']) * 100:+6.1f} pts")
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    """Parse 'analyze=1,health=4,metrics=1' into endpoint weights."""
+    weights = {}
+    for item in mix.split(","):
+        endpoint, weight = item.split("=")
+        if endpoint not in ("analyze", "health", "metrics"):
+            raise argparse.ArgumentTypeError(f"Unknown endpoint in mix: {endpoint}")
+        weights[endpoint] = int(weight)
+    return weights
+
+
+def main():
+    """Main CLI interface."""
+    parser = argparse.ArgumentParser(description="Load test app.py against a local fake Gemini")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent simulated users")
+    parser.add_argument("--duration", type=float, default=30, help="Test duration in seconds")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("analyze=1,health=4,metrics=1"),
+                        help="Endpoint weights, e.g. analyze=1,health=4,metrics=1")
+    parser.add_argument("--think-ms", type=float, default=0, help="Pause between a user's requests")
+    parser.add_argument("--latency-ms", type=float, default=300, help="Fake model mean latency")
+    parser.add_argument("--jitter-ms", type=float, default=100, help="Fake model latency jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fake model error rate (0-1)")
+    parser.add_argument("--function", default="first", help="generic_function sent to /api/analyze")
+    parser.add_argument("--source-file", default="arc-dsl/solvers.py", help="source_file sent to /api/analyze")
+    parser.add_argument("--request-timeout", type=float, default=60, help="Client timeout per request")
+    parser.add_argument("--target", help="Base URL of an already running app (skips starting servers)")
+    parser.add_argument("--label", default=time.strftime("%Y%m%d_%H%M%S"), help="Name for this run")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    processes = []
+    fake_url = None
+    startup_seconds = None
+    try:
+        if args.target:
+            base_url = args.target.rstrip("/")
+        else:
+            fake_port, app_port = free_port(), free_port()
+            fake_url = f"http://127.0.0.1:{fake_port}"
+            base_url = f"http://127.0.0.1:{app_port}"
+            processes.append(start_server("fake_gemini", fake_port, {
+                "FAKE_GEMINI_LATENCY_MS": str(args.latency_ms),
+                "FAKE_GEMINI_JITTER_MS": str(args.jitter_ms),
+                "FAKE_GEMINI_ERROR_RATE": str(args.error_rate),
+            }))
+            wait_until_ready(f"{fake_url}/stats")
+            processes.append(start_server("app", app_port, {
+                "GOOGLE_API_KEY": "fake-key",
+                "GEMINI_BASE_URL": fake_url,
+            }))
+        startup_seconds = wait_until_ready(f"{base_url}/api/health")
+
+        print(f"🚀 {args.users} users for {args.duration:.0f}s against {base_url}")
+        records: List[Dict] = []
+        lock = threading.Lock()
+        start = time.perf_counter()
+        deadline = start + args.duration
+        with ThreadPoolExecutor(max_workers=args.users) as pool:
+            for _ in range(args.users):
+                pool.submit(run_user, base_url, args.mix, deadline, args, records, lock)
+        elapsed = time.perf_counter() - start
+
+        model_calls = model_errors = None
+        if fake_url:
+            with urllib.request.urlopen(f"{fake_url}/stats") as response:
+                stats = json.loads(response.read())
+            model_calls, model_errors = stats["requests"], stats["errors"]
+    finally:
+        for process in processes:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+    if not records:
+        print("❌ No requests completed")
+        raise SystemExit(1)
+
+    result = {
+        "config": {
+            "label": args.label,
+            "users": args.users,
+            "duration": args.duration,
+            "mix": args.mix,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "error_rate": args.error_rate,
+            "target": args.target,
+        },
+        "elapsed_seconds": elapsed,
+        "startup_seconds": None if args.target else startup_seconds,
+        "model_calls": model_calls,
+        "model_errors": model_errors,
+        "summary": summarize(records, elapsed),
+    }
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    print_report(result, baseline)
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2))
+        print(f"\n💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
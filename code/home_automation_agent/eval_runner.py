@@ -0,0 +1,356 @@
+"""
+Local Evaluation Runner for the Home Automation Agent
+
+Runs ADK evalset cases concurrently (bounded by a semaphore) and scores them
+with the criteria from test_config.json. Model calls go through a pluggable
+backend so suites can run offline:
+
+    live    - the agent's own Gemini model (with its retry_options)
+    replay  - recorded responses from a fixture cache; misses fall through to
+              Gemini and are recorded (use --offline to fail on a miss instead)
+    fake    - scripted per case from the expected trajectory of each turn
+
+Usage (from the code/ directory):
+    python -m home_automation_agent.eval_runner home_automation_agent/integration.evalset.json
+    python -m home_automation_agent.eval_runner home_automation_agent/*.evalset.json --backend fake
+    python -m home_automation_agent.eval_runner home_automation_agent/*.evalset.json --backend replay --offline
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+from rouge_score import rouge_scorer
+
+from .agent import root_agent
+
+AGENT_DIR = Path(__file__).parent
+DEFAULT_CONFIG = AGENT_DIR / "test_config.json"
+DEFAULT_FIXTURES = AGENT_DIR / "eval_fixtures.json"
+
+
+# ============================================================================
+# Model Backends
+# ============================================================================
+
+def _strip_ids(value: Any) -> Any:
+    """Drop the random ADK call ids so identical prompts hash identically."""
+    if isinstance(value, dict):
+        return {k: _strip_ids(v) for k, v in value.items() if k != "id"}
+    if isinstance(value, list):
+        return [_strip_ids(v) for v in value]
+    return value
+
+
+def prompt_key(llm_request: LlmRequest) -> str:
+    """Hash everything the model sees: model name, instruction, tools and history."""
+    config = llm_request.config
+    payload = {
+        "model": llm_request.model,
+        "system_instruction": str(config.system_instruction) if config else None,
+        "tools": [t.model_dump(mode="json", exclude_none=True) for t in (config.tools or [])] if config else [],
+        "contents": [c.model_dump(mode="json", exclude_none=True) for c in llm_request.contents],
+    }
+    encoded = json.dumps(_strip_ids(payload), sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class ReplayLlm(BaseLlm):
+    """Serves recorded responses when the prompt is unchanged, else asks `inner`."""
+
+    inner: Optional[BaseLlm] = None
+    responses: Dict[str, List[Dict]] = {}
+    hits: int = 0
+    misses: int = 0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        key = prompt_key(llm_request)
+        if key in self.responses:
+            self.hits += 1
+            for recorded in self.responses[key]:
+                yield LlmResponse.model_validate(recorded)
+            return
+
+        self.misses += 1
+        if self.inner is None:
+            raise KeyError(f"No recorded response for prompt {key[:12]} (offline mode)")
+
+        recorded = []
+        async for response in self.inner.generate_content_async(llm_request, stream=False):
+            recorded.append(response.model_dump(mode="json", exclude_none=True))
+            yield response
+        self.responses[key] = recorded
+
+
+class FakeLlm(BaseLlm):
+    """Scripted model for one eval case: per turn, its expected tool calls, then its answer."""
+
+    turns: List[Dict] = []
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        # The current turn starts at the latest user text message
+        user_turns = [
+            i for i, c in enumerate(llm_request.contents)
+            if c.role == "user" and any(p.text for p in c.parts or [])
+        ]
+        turn_index = max(0, len(user_turns) - 1)
+        script = self.turns[turn_index] if turn_index < len(self.turns) else {
+            "expected_tool_uses": [], "expected_response": ""
+        }
+        current_turn = llm_request.contents[user_turns[-1] if user_turns else 0:]
+        tools_done = any(p.function_response for c in current_turn for p in c.parts or [])
+
+        if script["expected_tool_uses"] and not tools_done:
+            parts = [
+                types.Part(function_call=types.FunctionCall(name=t["name"], args=t["args"]))
+                for t in script["expected_tool_uses"]
+            ]
+        else:
+            parts = [types.Part(text=script["expected_response"])]
+        yield LlmResponse(content=types.Content(role="model", parts=parts))
+
+
+# ============================================================================
+# Evalset Loading & Scoring
+# ============================================================================
+
+def _text(content: Optional[Dict]) -> str:
+    if not content:
+        return ""
+    return "".join(p.get("text") or "" for p in content.get("parts", []))
+
+
+def expected_tool_uses(invocation: Dict) -> List[Dict]:
+    """Read expected tool calls from either evalset layout (tool_uses or invocation_events)."""
+    data = invocation.get("intermediate_data") or {}
+    if "tool_uses" in data:
+        return [{"name": t["name"], "args": t.get("args", {})} for t in data["tool_uses"]]
+
+    tool_uses = []
+    for event in data.get("invocation_events", []):
+        for part in (event.get("content") or {}).get("parts", []):
+            call = part.get("function_call")
+            if call:
+                tool_uses.append({"name": call["name"], "args": call.get("args", {})})
+    return tool_uses
+
+
+def load_cases(evalset_paths: List[Path]) -> List[Dict]:
+    """Load eval cases; each keeps its conversation turns in order."""
+    cases = []
+    for path in evalset_paths:
+        evalset = json.loads(path.read_text())
+        set_id = evalset.get("eval_set_id", path.stem)
+        for case in evalset["eval_cases"]:
+            cases.append({
+                "eval_set_id": set_id,
+                "eval_id": case["eval_id"],
+                "turns": [
+                    {
+                        "prompt": _text(invocation["user_content"]),
+                        "expected_tool_uses": expected_tool_uses(invocation),
+                        "expected_response": _text(invocation.get("final_response")),
+                    }
+                    for invocation in case["conversation"]
+                ],
+            })
+    return cases
+
+
+def tool_trajectory_score(actual: List[Dict], expected: List[Dict]) -> float:
+    """1.0 when the tool calls match exactly (name, args and order), else 0.0."""
+    return 1.0 if actual == expected else 0.0
+
+
+_rouge = rouge_scorer.RougeScorer(["rouge1"], use_stemmer=True)
+
+
+def response_match_score(actual: str, expected: str) -> float:
+    """ROUGE-1 F-measure with Porter stemming, the same scorer `adk eval` uses."""
+    return _rouge.score(target=expected, prediction=actual)["rouge1"].fmeasure
+
+
+# ============================================================================
+# Runner
+# ============================================================================
+
+async def run_case(case: Dict, model: BaseLlm, criteria: Dict[str, float],
+                   semaphore: asyncio.Semaphore) -> Dict:
+    """Run a case's turns in order within one session and score it against the criteria.
+
+    Scores are averaged over turns, as `adk eval` does per invocation.
+    """
+    async with semaphore:
+        agent = root_agent.model_copy(update={"model": model})
+        runner = InMemoryRunner(agent=agent, app_name=agent.name)
+        session = await runner.session_service.create_session(app_name=agent.name, user_id="eval")
+
+        turn_results = []
+        error = None
+        start = time.perf_counter()
+        for turn in case["turns"]:
+            actual_tool_uses = []
+            final_response = ""
+            turn_start = time.perf_counter()
+            try:
+                async for event in runner.run_async(
+                    user_id="eval",
+                    session_id=session.id,
+                    new_message=types.Content(role="user", parts=[types.Part(text=turn["prompt"])]),
+                ):
+                    for call in event.get_function_calls():
+                        actual_tool_uses.append({"name": call.name, "args": dict(call.args or {})})
+                    if event.is_final_response() and event.content:
+                        final_response = "".join(p.text or "" for p in event.content.parts or [])
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            turn_results.append({
+                **turn,
+                "actual_tool_uses": actual_tool_uses,
+                "actual_response": final_response,
+                "scores": {
+                    "tool_trajectory_avg_score": tool_trajectory_score(actual_tool_uses, turn["expected_tool_uses"]),
+                    "response_match_score": response_match_score(final_response, turn["expected_response"]),
+                },
+                "latency_seconds": time.perf_counter() - turn_start,
+            })
+            if error:
+                # Later turns depend on this one's history, so stop here
+                break
+        latency = time.perf_counter() - start
+
+    scores = {
+        metric: sum(t["scores"][metric] for t in turn_results) / len(case["turns"])
+        for metric in turn_results[0]["scores"]
+    } if turn_results else {}
+    passed = error is None and all(
+        scores[metric] >= threshold for metric, threshold in criteria.items() if metric in scores
+    )
+    return {
+        "eval_set_id": case["eval_set_id"],
+        "eval_id": case["eval_id"],
+        "turns": turn_results,
+        "scores": scores,
+        "passed": passed,
+        "error": error,
+        "latency_seconds": latency,
+    }
+
+
+def build_model(backend: str, fixtures: Path, offline: bool) -> Optional[BaseLlm]:
+    """Create the model backend shared by all cases (None for 'fake', which is per case)."""
+    if backend == "live":
+        return root_agent.model
+    if backend == "fake":
+        return None
+
+    responses = json.loads(fixtures.read_text()) if fixtures.exists() else {}
+    return ReplayLlm(
+        model=root_agent.model.model,
+        inner=None if offline else root_agent.model,
+        responses=responses,
+    )
+
+
+async def run_evalsets(evalset_paths: List[Path], backend: str = "replay", concurrency: int = 4,
+                       config_path: Path = DEFAULT_CONFIG, fixtures: Path = DEFAULT_FIXTURES,
+                       offline: bool = False) -> Dict[str, Any]:
+    """Run all cases of the given evalsets concurrently.
+
+    Args:
+        evalset_paths: Evalset JSON files to run.
+        backend: Model backend, one of 'live', 'replay' or 'fake'.
+        concurrency: Maximum number of cases in flight at once.
+        config_path: test_config.json holding the pass criteria.
+        fixtures: Recorded-response cache used by the 'replay' backend.
+        offline: With 'replay', fail on cache misses instead of calling Gemini.
+
+    Returns:
+        A dictionary with per-case results, totals and wall-clock time.
+    """
+    criteria = json.loads(config_path.read_text())["criteria"]
+    cases = load_cases(evalset_paths)
+    model = build_model(backend, fixtures, offline)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    # Concurrency is across cases; turns within a case run in order
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        run_case(c, model or FakeLlm(model="fake", turns=c["turns"]), criteria, semaphore)
+        for c in cases
+    ))
+    wall_time = time.perf_counter() - start
+
+    summary = {
+        "backend": backend,
+        "concurrency": concurrency,
+        "results": results,
+        "passed": sum(r["passed"] for r in results),
+        "total": len(results),
+        "wall_seconds": wall_time,
+    }
+    if isinstance(model, ReplayLlm):
+        if model.misses and not offline:
+            fixtures.write_text(json.dumps(model.responses, indent=2, sort_keys=True))
+        summary["cache"] = {"hits": model.hits, "misses": model.misses}
+    return summary
+
+
+def print_report(summary: Dict[str, Any]) -> None:
+    """Print per-case status, scores and latency, then totals."""
+    print(f"\n{'='*78}")
+    print(f"EVAL RESULTS (backend={summary['backend']}, concurrency={summary['concurrency']})")
+    print(f"{'='*78}")
+    for r in summary["results"]:
+        status = "✅ PASS" if r["passed"] else "❌ FAIL"
+        scores = "  ".join(f"{name.split('_')[0]}={score:.2f}" for name, score in r["scores"].items())
+        turns = f" ({len(r['turns'])} turns)" if len(r["turns"]) > 1 else ""
+        print(f"{status}  {r['latency_seconds']*1000:8.1f} ms  {r['eval_set_id']}/{r['eval_id']}{turns}  {scores}")
+        if r["error"]:
+            print(f"         error: {r['error']}")
+
+    latencies = sorted(r["latency_seconds"] for r in summary["results"])
+    print(f"{'─'*78}")
+    print(f"Passed {summary['passed']}/{summary['total']} in {summary['wall_seconds']:.2f}s wall time")
+    if latencies:
+        print(f"Case latency: median {latencies[len(latencies) // 2]*1000:.1f} ms, max {latencies[-1]*1000:.1f} ms")
+    if "cache" in summary:
+        print(f"Replay cache: {summary['cache']['hits']} hits, {summary['cache']['misses']} misses")
+
+
+def main():
+    """Main CLI interface."""
+    parser = argparse.ArgumentParser(description="Run ADK evalsets concurrently with replay/fake models")
+    parser.add_argument("evalsets", nargs="+", type=Path, help="Evalset JSON files")
+    parser.add_argument("--backend", choices=["live", "replay", "fake"], default="replay")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum cases in flight")
+    parser.add_argument("--config", type=Path, default=DEFAULT_CONFIG, help="test_config.json with criteria")
+    parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES, help="Recorded response cache")
+    parser.add_argument("--offline", action="store_true", help="Fail on replay cache misses")
+    parser.add_argument("--output", type=Path, help="Write full results as JSON")
+    args = parser.parse_args()
+
+    summary = asyncio.run(run_evalsets(
+        args.evalsets, args.backend, args.concurrency, args.config, args.fixtures, args.offline
+    ))
+    print_report(summary)
+    if args.output:
+        args.output.write_text(json.dumps(summary, indent=2))
+    raise SystemExit(0 if summary["passed"] == summary["total"] else 1)
+
+
+if __name__ == "__main__":
+    main()
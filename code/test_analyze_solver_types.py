@@ -0,0 +1,134 @@
+"""Unit checks for CallSiteClassifier on a small stand-in dsl.py."""
+
+import textwrap
+
+import pytest
+
+from analyze_solver_types import CallSiteClassifier, DSLTypeAnalyzer, SolverTypeInference
+
+DSL_SOURCE = '''
+def first(container: Container) -> Any:
+    return next(iter(container))
+
+
+def last(container: Container) -> Any:
+    return max(enumerate(container))[1]
+
+
+def objects(grid: Grid, univalued: Boolean, diagonal: Boolean, without_bg: Boolean) -> Objects:
+    return frozenset()
+
+
+def hsplit(grid: Grid, n: Integer) -> Tuple:
+    return tuple()
+
+
+def order(container: Container, compfunc: Callable) -> Tuple:
+    return tuple(sorted(container, key=compfunc))
+
+
+def size(container: Container) -> Integer:
+    return len(container)
+
+
+def last_any(container: Any) -> Any:
+    return max(enumerate(container))[1]
+
+
+def last_grid(container: Tuple[Grid, ...]) -> Grid:
+    return container[-1]
+
+
+def last_object(container: Objects) -> Object:
+    return max(enumerate(container))[1]
+'''
+
+CANDIDATES = ['last_any', 'last_grid', 'last_object']
+
+
+@pytest.fixture
+def classifier(tmp_path):
+    dsl_file = tmp_path / 'dsl.py'
+    dsl_file.write_text(DSL_SOURCE)
+    return CallSiteClassifier(SolverTypeInference(DSLTypeAnalyzer(str(dsl_file))))
+
+
+def classify(classifier, body, candidates=CANDIDATES):
+    source = 'def solve_test(I):\n' + textwrap.indent(textwrap.dedent(body), '    ')
+    return source, classifier.classify_source(source, 'last', candidates)
+
+
+def test_any_argument_is_ambiguous(classifier):
+    _, results = classify(classifier, '''
+        x1 = objects(I, T, F, T)
+        x2 = first(x1)
+        O = last(x2)
+        return O
+    ''')
+    assert results[0]['arg_type'] == 'Any'
+    assert results[0]['scores']['last_any'] < CallSiteClassifier.EXACT_MATCH
+    confident, ambiguous = classifier.partition(results)
+    assert not confident and len(ambiguous) == 1
+
+
+def test_objects_argument_maps_to_last_object(classifier):
+    _, results = classify(classifier, '''
+        x1 = objects(I, T, F, T)
+        O = last(x1)
+        return O
+    ''')
+    assert results[0]['suggested_replacement'] == 'last_object'
+    confident, _ = classifier.partition(results)
+    assert confident == results
+
+
+def test_name_match_alone_is_not_auto_applied(classifier):
+    # last_object(container: Container) only matches Objects by its name
+    classifier.dsl.param_types['last_object'] = ['Container']
+    _, results = classify(classifier, '''
+        x1 = objects(I, T, F, T)
+        O = last(x1)
+        return O
+    ''')
+    assert results[0]['suggested_replacement'] == 'last_object'
+    confident, ambiguous = classifier.partition(results)
+    assert not confident and ambiguous == results
+
+
+@pytest.mark.parametrize('producer', ['hsplit(I, TWO)', 'order(hsplit(I, TWO), size)'])
+def test_split_grids_map_to_last_grid(classifier, producer):
+    _, results = classify(classifier, f'''
+        x1 = {producer}
+        O = last(x1)
+        return O
+    ''')
+    assert results[0]['arg_type'] == 'Tuple[Grid, ...]'
+    assert results[0]['suggested_replacement'] == 'last_grid'
+    confident, _ = classifier.partition(results)
+    assert confident == results
+
+
+def test_nested_calls_are_rewritten_by_column(classifier):
+    source, results = classify(classifier, '''
+        x1 = objects(I, T, F, T)
+        x2 = last(last(x1))
+        O = last(hsplit(I, TWO))
+        return O
+    ''')
+    assert [(r['line'], r['col']) for r in results] == [(4, 9), (4, 14), (5, 8)]
+    # The outer last() sees an Any argument, so only the inner call is rewritten
+    confident, ambiguous = classifier.partition(results)
+    rewritten = classifier.apply_replacements(source, 'last', confident)
+    assert 'x2 = last(last_object(x1))' in rewritten
+    assert 'O = last_grid(hsplit(I, TWO))' in rewritten
+    assert len(ambiguous) == 1 and ambiguous[0]['arg_type'] == 'Any'
+
+
+def test_apply_replacements_rejects_moved_calls(classifier):
+    source, results = classify(classifier, '''
+        x1 = objects(I, T, F, T)
+        O = last(x1)
+        return O
+    ''')
+    with pytest.raises(ValueError):
+        classifier.apply_replacements(source.replace('O = last', 'O =  last'), 'last', results)